@@ -26,6 +26,8 @@ import sys
 _BRACKETS_PATTERN = re.compile(r"\[[^\]]*\]")
 _QUOTES_PATTERN = re.compile(r"(\"[^\"]*\"|\'[^\']*\')")
 _WHITESPACE_PATTERN = re.compile(r"\s+")
+_SLICING_PATTERN = re.compile(r"^\[(\d|,|\s|:)+\]$")
+_INF_PATTERN = re.compile(r"inf")
 
 _NUMBER_PATTERN = re.compile(r"[-+]?(\d+(\.\d*)?|\.\d+)([eE][-+]?\d+)?")
 
@@ -184,7 +186,7 @@ def validate_slicing_string(slicing_string):
     (bool) True if and only if the slicing string is valid.
   """
 
-  return bool(re.search(r"^\[(\d|,|\s|:)+\]$", slicing_string))
+  return bool(_SLICING_PATTERN.search(slicing_string))
 
 
 def _parse_slices(slicing_string):
@@ -231,7 +233,7 @@ def parse_indices(indices_string):
   """
 
   # Strip whitespace.
-  indices_string = re.sub(r"\s+", "", indices_string)
+  indices_string = _WHITESPACE_PATTERN.sub("", indices_string)
 
   # Strip any brackets at the two ends.
   if indices_string.startswith("[") and indices_string.endswith("]"):
@@ -261,7 +263,7 @@ def parse_ranges(range_string):
     return []
 
   if "inf" in range_string:
-    range_string = re.sub(r"inf", repr(sys.float_info.max), range_string)
+    range_string = _INF_PATTERN.sub(repr(sys.float_info.max), range_string)
 
   ranges = ast.literal_eval(range_string)
   if isinstance(ranges, list) and not isinstance(ranges[0], list):
@@ -393,26 +393,26 @@ class ParseReadableTimeStrTest(test_util.TensorFlowTestCase):
 class ParseInterval(test_util.TensorFlowTestCase):
 
   def testParseTimeInterval(self):
-    self.assertEquals(
+    self.assertEqual(
         command_parser.Interval(10, True, 1e3, True),
         command_parser.parse_time_interval("[10us, 1ms]"))
-    self.assertEquals(
+    self.assertEqual(
         command_parser.Interval(10, False, 1e3, False),
         command_parser.parse_time_interval("(10us, 1ms)"))
-    self.assertEquals(
+    self.assertEqual(
         command_parser.Interval(10, False, 1e3, True),
         command_parser.parse_time_interval("(10us, 1ms]"))
-    self.assertEquals(
+    self.assertEqual(
         command_parser.Interval(10, True, 1e3, False),
         command_parser.parse_time_interval("[10us, 1ms)"))
-    self.assertEquals(command_parser.Interval(0, False, 1e3, True),
-                      command_parser.parse_time_interval("<=1ms"))
-    self.assertEquals(
+    self.assertEqual(command_parser.Interval(0, False, 1e3, True),
+                     command_parser.parse_time_interval("<=1ms"))
+    self.assertEqual(
         command_parser.Interval(1e3, True, float("inf"), False),
         command_parser.parse_time_interval(">=1ms"))
-    self.assertEquals(command_parser.Interval(0, False, 1e3, False),
-                      command_parser.parse_time_interval("<1ms"))
-    self.assertEquals(
+    self.assertEqual(command_parser.Interval(0, False, 1e3, False),
+                     command_parser.parse_time_interval("<1ms"))
+    self.assertEqual(
         command_parser.Interval(1e3, False, float("inf"), False),
         command_parser.parse_time_interval(">1ms"))
 
@@ -454,27 +454,27 @@ class ParseInterval(test_util.TensorFlowTestCase):
       command_parser.parse_time_interval("[1s, 1ms]")
 
   def testParseMemoryInterval(self):
-    self.assertEquals(
+    self.assertEqual(
         command_parser.Interval(1024, True, 2048, True),
         command_parser.parse_memory_interval("[1k, 2k]"))
-    self.assertEquals(
+    self.assertEqual(
         command_parser.Interval(1024, False, 2048, False),
         command_parser.parse_memory_interval("(1kB, 2kB)"))
-    self.assertEquals(
+    self.assertEqual(
         command_parser.Interval(1024, False, 2048, True),
         command_parser.parse_memory_interval("(1k, 2k]"))
-    self.assertEquals(
+    self.assertEqual(
         command_parser.Interval(1024, True, 2048, False),
         command_parser.parse_memory_interval("[1k, 2k)"))
-    self.assertEquals(
+    self.assertEqual(
         command_parser.Interval(0, False, 2048, True),
         command_parser.parse_memory_interval("<=2k"))
-    self.assertEquals(
+    self.assertEqual(
         command_parser.Interval(11, True, float("inf"), False),
         command_parser.parse_memory_interval(">=11"))
-    self.assertEquals(command_parser.Interval(0, False, 2048, False),
-                      command_parser.parse_memory_interval("<2k"))
-    self.assertEquals(
+    self.assertEqual(command_parser.Interval(0, False, 2048, False),
+                     command_parser.parse_memory_interval("<2k"))
+    self.assertEqual(
         command_parser.Interval(11, False, float("inf"), False),
         command_parser.parse_memory_interval(">11"))
 
@@ -31,6 +31,19 @@ from tensorflow.python.debug.lib import stepper
 RL = debugger_cli_common.RichLine
 
 
+def _index_nodes(node_names):
+  """Map node names to their indices in a list of node names.
+
+  Args:
+    node_names: (list of str) Names of the nodes, e.g., topologically sorted.
+
+  Returns:
+    (dict) A dict mapping node names to their (0-based) indices in node_names.
+  """
+
+  return {node_name: i for i, node_name in enumerate(node_names)}
+
+
 class NodeStepperCLI(object):
   """Command-line-interface backend of Node Stepper."""
 
@@ -199,6 +212,7 @@ class NodeStepperCLI(object):
 
     # Get the elements in the sorted transitive closure, as a list of str.
     self._sorted_nodes = self._node_stepper.sorted_nodes()
+    self._node_indices = _index_nodes(self._sorted_nodes)
     self._closure_elements = self._node_stepper.closure_elements()
     self._placeholders = self._node_stepper.placeholders()
     self._completed_nodes = set()
@@ -208,16 +222,18 @@ class NodeStepperCLI(object):
   def _calculate_next(self):
     """Calculate the next target for "step" action based on current state."""
 
-    override_names = self._node_stepper.override_names()
+    override_names = set(self._node_stepper.override_names())
 
-    next_i = -1
-    for i in xrange(len(self._sorted_nodes)):
-      if (i > next_i and (self._sorted_nodes[i] in self._completed_nodes) or
-          (self._sorted_nodes[i] in override_names)):
-        next_i = i
+    # The next target is the node right after the last node that has been
+    # completed or overridden. Search backwards from the end, so that the
+    # search stops at that node.
+    last_i = next(
+        (i for i in xrange(len(self._sorted_nodes) - 1, -1, -1)
+         if (self._sorted_nodes[i] in self._completed_nodes or
+             self._sorted_nodes[i] in override_names)),
+        -1)
 
-    next_i += 1
-    self._next = next_i
+    self._next = last_i + 1
 
   def list_sorted_nodes(self, args, screen_info=None):
     """List the sorted transitive closure of the stepper's fetches."""
@@ -239,13 +255,17 @@ class NodeStepperCLI(object):
       verbose = True
 
     handle_node_names = self._node_stepper.handle_node_names()
-    intermediate_tensor_names = self._node_stepper.intermediate_tensor_names()
+    intermediate_node_names = set(
+        tensor_name.split(":")[0] for tensor_name in
+        self._node_stepper.intermediate_tensor_names())
     override_names = self._node_stepper.override_names()
     dirty_variable_names = [
         dirty_variable.split(":")[0]
         for dirty_variable in self._node_stepper.dirty_variables()
     ]
 
+    num_nodes = len(self._sorted_nodes)
+
     lines = []
     if verbose:
       lines.extend(
@@ -261,11 +281,11 @@ class NodeStepperCLI(object):
       else:
         node_prefix = RL("     ")
 
-      node_prefix += "(%d / %d)" % (i + 1, len(self._sorted_nodes)) + "  ["
+      node_prefix += "(%d / %d)" % (i + 1, num_nodes) + "  ["
       node_prefix += self._get_status_labels(
           element_name,
           handle_node_names,
-          intermediate_tensor_names,
+          intermediate_node_names,
           override_names,
           dirty_variable_names)
 
@@ -281,7 +301,7 @@ class NodeStepperCLI(object):
   def _get_status_labels(self,
                          element_name,
                          handle_node_names,
-                         intermediate_tensor_names,
+                         intermediate_node_names,
                          override_names,
                          dirty_variable_names):
     """Get a string of status labels for a graph element.
@@ -297,8 +317,8 @@ class NodeStepperCLI(object):
       element_name: (str) name of the graph element.
       handle_node_names: (list of str) Names of the nodes of which the output
         tensors' handles are available.
-      intermediate_tensor_names: (list of str) Names of the intermediate tensor
-        dumps generated from the graph element.
+      intermediate_node_names: (set of str) Names of the nodes from which
+        intermediate tensor dumps are available.
       override_names: (list of str) Names of the tensors of which the values
         are overridden.
       dirty_variable_names: (list of str) Names of the dirty variables.
@@ -321,8 +341,6 @@ class NodeStepperCLI(object):
     status += (RL(self.STATE_CONT, self._STATE_COLORS[self.STATE_CONT])
                if element_name in handle_node_names else " ")
 
-    intermediate_node_names = [
-        tensor_name.split(":")[0] for tensor_name in intermediate_tensor_names]
     status += (RL(self.STATE_DUMPED_INTERMEDIATE,
                   self._STATE_COLORS[self.STATE_DUMPED_INTERMEDIATE])
                if element_name in intermediate_node_names else " ")
@@ -385,17 +403,16 @@ class NodeStepperCLI(object):
     # Determine which node is being continued to, so the _next pointer can be
     # set properly.
     node_name = parsed.target_name.split(":")[0]
-    if node_name not in self._sorted_nodes:
+    if node_name not in self._node_indices:
       return cli_shared.error(self._MESSAGE_TEMPLATES["NOT_IN_CLOSURE"] %
                               parsed.target_name)
-    self._next = self._sorted_nodes.index(node_name)
+    self._next = self._node_indices[node_name]
 
-    cont_result = self._node_stepper.cont(
+    cont_result = self._cont_no_output(
         parsed.target_name,
         invalidate_from_updated_variables=(
             parsed.invalidate_from_updated_variables),
         restore_variable_values=parsed.restore_variable_values)
-    self._completed_nodes.add(parsed.target_name.split(":")[0])
 
     screen_output = debugger_cli_common.RichTextLines(
         ["Continued to %s:" % parsed.target_name, ""])
@@ -420,6 +437,31 @@ class NodeStepperCLI(object):
 
     return final_output
 
+  def _cont_no_output(self,
+                      target_name,
+                      invalidate_from_updated_variables=False,
+                      restore_variable_values=False):
+    """Perform a cont() call on the node stepper without generating output.
+
+    Args:
+      target_name: (str) Name of the Tensor or Op to continue to.
+      invalidate_from_updated_variables: (bool) Same as the argument of the
+        same name to `NodeStepper.cont()`.
+      restore_variable_values: (bool) Same as the argument of the same name to
+        `NodeStepper.cont()`.
+
+    Returns:
+      Return value of the `NodeStepper.cont()` call.
+    """
+
+    cont_result = self._node_stepper.cont(
+        target_name,
+        invalidate_from_updated_variables=invalidate_from_updated_variables,
+        restore_variable_values=restore_variable_values)
+    self._completed_nodes.add(target_name.split(":")[0])
+
+    return cont_result
+
   def _report_last_feed_types(self):
     """Generate a report of the feed types used in the cont/step call.
 
@@ -478,11 +520,16 @@ class NodeStepperCLI(object):
       return debugger_cli_common.RichTextLines(
           "ERROR: Invalid number of times to step: %d" % parsed.num_times)
 
-    for _ in xrange(parsed.num_times):
+    for i in xrange(parsed.num_times):
       if self._next >= len(self._sorted_nodes):
         return debugger_cli_common.RichTextLines(
             "ERROR: Cannot step any further because the end of the sorted "
             "transitive closure has been reached.")
+      elif i < parsed.num_times - 1:
+        # Only the screen output of the last step is shown, so skip the
+        # generation of the screen output for the intermediate steps.
+        self._cont_no_output(self._sorted_nodes[self._next])
+        self._calculate_next()
       else:
         screen_output = self.cont([self._sorted_nodes[self._next]], screen_info)
 
@@ -600,7 +647,7 @@ class NodeStepperCLI(object):
 
     if element_name in self._closure_elements and ":" in element_name:
       return [element_name]
-    if (element_name in self._sorted_nodes or
+    if (element_name in self._node_indices or
         (element_name in self._closure_elements and ":" not in element_name)):
       slots = self._node_stepper.output_slots_in_closure(element_name)
       return [(element_name + ":%d" % slot) for slot in slots]
@@ -223,10 +223,12 @@ def has_inf_or_nan(datum, tensor):
     # arrays.
     return False
   elif (np.issubdtype(tensor.dtype, np.float) or
-        np.issubdtype(tensor.dtype, np.complex) or
-        np.issubdtype(tensor.dtype, np.integer)):
-    return np.any(np.isnan(tensor)) or np.any(np.isinf(tensor))
+        np.issubdtype(tensor.dtype, np.complex)):
+    # A single vectorized pass: an element is finite if and only if it is
+    # neither nan nor inf.
+    return not np.all(np.isfinite(tensor))
   else:
+    # Integer tensors cannot hold nan or inf values.
     return False
 
 
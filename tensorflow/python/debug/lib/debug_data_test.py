@@ -92,6 +92,9 @@ class HasNanOrInfTest(test_util.TensorFlowTestCase):
     b = np.array([1j, 3j, 3j, 7j, np.nan], dtype=np.complex128)
     self.assertTrue(debug_data.has_inf_or_nan(self._dummy_datum, b))
 
+    c = np.array([1j, 3j, complex(0.0, np.inf)], dtype=np.complex128)
+    self.assertTrue(debug_data.has_inf_or_nan(self._dummy_datum, c))
+
   def testDTypeIntegerWorks(self):
     a = np.array([1, 3, 3, 7], dtype=np.int16)
     self.assertFalse(debug_data.has_inf_or_nan(self._dummy_datum, a))
@@ -41,6 +41,7 @@ from tensorflow.python.debug.lib import grpc_debug_server
 from tensorflow.python.framework import constant_op
 from tensorflow.python.framework import errors
 from tensorflow.python.ops import variables
+from tensorflow.python.platform import tf_logging
 from tensorflow.python.util import compat
 
 
@@ -450,7 +451,7 @@ def _poll_server_till_success(max_attempts,
   with session.Session(config=config) as sess:
     for poll_count in range(max_attempts):
       server.clear_data()
-      print("Polling: poll_count = %d" % poll_count)
+      tf_logging.debug("Polling: poll_count = %d", poll_count)
 
       x_init_name = "x_init_%d" % poll_count
       x_init = constant_op.constant([42.0], shape=[1], name=x_init_name)
@@ -468,17 +469,17 @@ def _poll_server_till_success(max_attempts,
         if os.path.isdir(
             dump_dir) and debug_data.DebugDumpDir(dump_dir).size > 0:
           shutil.rmtree(dump_dir)
-          print("Poll succeeded.")
+          tf_logging.debug("Poll succeeded.")
           return True
         else:
-          print("Poll failed. Sleeping for %f s" % sleep_per_poll_sec)
+          tf_logging.debug("Poll failed. Sleeping for %f s", sleep_per_poll_sec)
           time.sleep(sleep_per_poll_sec)
       else:
         if server.debug_tensor_values:
-          print("Poll succeeded.")
+          tf_logging.debug("Poll succeeded.")
           return True
         else:
-          print("Poll failed. Sleeping for %f s" % sleep_per_poll_sec)
+          tf_logging.debug("Poll failed. Sleeping for %f s", sleep_per_poll_sec)
           time.sleep(sleep_per_poll_sec)
 
     return False
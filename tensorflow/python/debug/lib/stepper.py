@@ -23,6 +23,7 @@ import shutil
 import tempfile
 import time
 
+import numpy as np
 import six
 
 from tensorflow.core.protobuf import config_pb2
@@ -164,6 +165,11 @@ class NodeStepper(object):
     # tensor handles.
     self._tensor_handles = {}
 
+    # Ops that get the session handles of tensors: a dict mapping tensor names
+    # to GetSessionHandle ops, so that repeated cont() calls on the same tensor
+    # do not add new ops to the graph.
+    self._session_handle_ops = {}
+
     # Cached intermediate tensor values: a dict mapping tensor names to
     # DebugTensorDatum.
     self._dumped_intermediate_tensors = {}
@@ -301,29 +307,33 @@ class NodeStepper(object):
 
     # Now that we have traversed the transitive closure and obtained the
     # node-input map, we can topologically sort them.
-    sorted_nodes = []
-    stack = []
+    # Build the reverse (node-consumer) map and the counts of unsorted inputs
+    # once, so that each sorted node needs to visit only its own consumers,
+    # instead of the entire node-input map.
+    node_consumers = dict()
+    num_unsorted_inputs = dict()
     for node in node_inputs:
-      if not node_inputs[node]:
-        stack.append(node)
-    for node in stack:
-      del node_inputs[node]
+      num_unsorted_inputs[node] = len(node_inputs[node])
+      for input_node in node_inputs[node]:
+        if input_node not in node_consumers:
+          node_consumers[input_node] = [node]
+        else:
+          node_consumers[input_node].append(node)
+
+    sorted_nodes = []
+    stack = [node for node in node_inputs if not node_inputs[node]]
 
     while stack:
       curr_node = stack.pop()
       sorted_nodes.append(curr_node)
 
-      # Iterate through the node-input map and remove the child.
+      # Decrement the unsorted-input counts of the consumers and push the ones
+      # that have no more unsorted inputs.
       pushes = []
-      for node in node_inputs:
-        if curr_node in node_inputs[node]:
-          node_inputs[node].remove(curr_node)
-          if not node_inputs[node]:
-            pushes.append(node)
-
-      # Delete new pushes from node-input map.
-      for node in pushes:
-        del node_inputs[node]
+      for node in node_consumers.get(curr_node, []):
+        num_unsorted_inputs[node] -= 1
+        if not num_unsorted_inputs[node]:
+          pushes.append(node)
 
       stack.extend(pushes)
 
@@ -394,7 +404,8 @@ class NodeStepper(object):
 
     Args:
       tensor_name: (str) Name of the tensor to override.
-      overriding_val: (numpy.ndarray) Overriding tensor value.
+      overriding_val: (numpy.ndarray) Overriding tensor value. Converted to
+        the dtype of the tensor, without copying if it already has that dtype.
 
     Raises:
       ValueError: If tensor_name does not correspond to a tensor in the input
@@ -411,6 +422,14 @@ class NodeStepper(object):
           "input tree to the fetch \"%s\"" %
           (tensor_name, repr(self._fetch_names)))
 
+    # Convert the overriding value to the dtype of the tensor once here, so
+    # that it can be fed in subsequent cont() calls without any further
+    # conversion. np.asarray() does not copy arrays that already have the
+    # right dtype.
+    tensor = self._sess.graph.as_graph_element(tensor_name)
+    if isinstance(tensor, ops.Tensor):
+      overriding_val = np.asarray(
+          overriding_val, dtype=tensor.dtype.base_dtype.as_numpy_dtype)
     self._override_tensors[tensor_name] = overriding_val
 
     # Invalidate cache by tracing outputs.
@@ -673,16 +692,18 @@ class NodeStepper(object):
       ])
       handle_names.extend(additional_handle_requests)
 
-      handles = self._sess.run(
-          [session_ops.get_session_handle(tensor) for tensor in
-           tensors_to_get_handles_for],
+      # The value of the target is fetched in the same Session.run() call as
+      # the tensor handles, so that it does not need to be retrieved through
+      # its handle in an extra Session.run() call.
+      run_results = self._sess.run(
+          [self._get_session_handle_op(tensor) for tensor in
+           tensors_to_get_handles_for] + [fetched],
           feed_dict=feeds,
           options=run_options)
+      handles, return_value = run_results[:-1], run_results[-1]
       for handle_name, handle in zip(handle_names, handles):
         self._tensor_handles[handle_name] = handle
 
-      return_value = self._tensor_handles[target_name].eval()
-
     self._load_dumped_intermediate_tensors(dump_path, target_name)
 
     if invalidate_from_updated_variables:
@@ -692,6 +713,24 @@ class NodeStepper(object):
 
     return return_value
 
+  def _get_session_handle_op(self, tensor):
+    """Get the op that obtains the session handle of a tensor.
+
+    The op is created on the first call for the tensor and cached for
+    subsequent calls.
+
+    Args:
+      tensor: (Tensor) The tensor to get the session handle for.
+
+    Returns:
+      The output of the GetSessionHandle op for the tensor.
+    """
+
+    if tensor.name not in self._session_handle_ops:
+      self._session_handle_ops[tensor.name] = session_ops.get_session_handle(
+          tensor)
+    return self._session_handle_ops[tensor.name]
+
   def _prepare_cont_call_dump_path_and_run_options(self):
     """Prepare the dump path and RunOptions for next cont() call.
 
@@ -814,12 +853,32 @@ class NodeStepper(object):
     first constructed.
     """
 
-    for var_name in self._dirty_variables:
-      self._sess.run(self._variable_initializers[var_name],
-                     feed_dict={
-                         self._variable_initial_values[var_name]:
-                             self._cached_variable_values[var_name]
-                     })
+    if not self._dirty_variables:
+      return
+
+    # Restore the dirty variables in as few Session.run() calls as possible.
+    # Variables created from the same initial-value tensor share a feed key,
+    # so they cannot be restored in the same call; each batch below feeds
+    # every initial-value tensor at most once.
+    pending = list(self._dirty_variables)
+    while pending:
+      batch = {}
+      deferred = []
+      for var_name in pending:
+        initial_value = self._variable_initial_values[var_name]
+        if initial_value in batch:
+          deferred.append(var_name)
+        else:
+          batch[initial_value] = var_name
+
+      self._sess.run(
+          [self._variable_initializers[var_name]
+           for var_name in batch.values()],
+          feed_dict={
+              initial_value: self._cached_variable_values[var_name]
+              for initial_value, var_name in batch.items()
+          })
+      pending = deferred
 
   def handle_names(self):
     """Return names of the TensorHandles that the debugger is holding.
@@ -889,7 +948,7 @@ class NodeStepper(object):
     """
 
     node_name = self._get_node_name(graph_element_name)
-    if node_name not in self.sorted_nodes():
+    if node_name not in self._transitive_closure_set:
       raise ValueError(
           "%s is not in the transitive closure of this NodeStepper "
           "instance" % graph_element_name)
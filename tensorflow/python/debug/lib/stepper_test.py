@@ -17,6 +17,8 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import numpy as np
+
 from tensorflow.core.protobuf import config_pb2
 from tensorflow.core.protobuf import rewriter_config_pb2
 from tensorflow.python.client import session
@@ -32,27 +34,45 @@ from tensorflow.python.ops import variables
 from tensorflow.python.platform import googletest
 from tensorflow.python.training import gradient_descent
 
+# Feed values and expected results for the placeholder-based tests.
+_PH0_FEED = np.array([[1.0, 2.0], [-3.0, 5.0]], dtype=np.float32)
+_PH1_FEED = np.array([[-1.0], [0.5]], dtype=np.float32)
+_X_EXPECTED = np.array([[0.0], [5.5]], dtype=np.float32)
+_Y_EXPECTED = np.array([[-1.0], [6.0]], dtype=np.float32)
+
+# The constants are shared among tests, and NodeStepper may hand the feed
+# values back to the caller without copying them, so make them read-only.
+for _constant in (_PH0_FEED, _PH1_FEED, _X_EXPECTED, _Y_EXPECTED):
+  _constant.setflags(write=False)
+
 
 class StepperTest(test_util.TensorFlowTestCase):
 
-  def setUp(self):
-    self.a = variables.Variable(2.0, name="a")
-    self.b = variables.Variable(3.0, name="b")
+  @classmethod
+  def setUpClass(cls):
+    # None of the tests in this class update the variables, so the graph and
+    # the session are shared among them.
+    cls.graph = ops.Graph()
+    with cls.graph.as_default():
+      cls.a = variables.Variable(2.0, name="a")
+      cls.b = variables.Variable(3.0, name="b")
 
-    self.c = math_ops.multiply(self.a, self.b, name="c")  # Should be 6.0.
-    self.d = math_ops.multiply(self.a, self.a, name="d")  # Should be 4.0.
+      cls.c = math_ops.multiply(cls.a, cls.b, name="c")  # Should be 6.0.
+      cls.d = math_ops.multiply(cls.a, cls.a, name="d")  # Should be 4.0.
 
-    self.e = math_ops.multiply(self.d, self.c, name="e")  # Should be 24.0.
+      cls.e = math_ops.multiply(cls.d, cls.c, name="e")  # Should be 24.0.
 
-    self.f_y = constant_op.constant(0.30, name="f_y")
-    self.f = math_ops.div(self.b, self.f_y, name="f")  # Should be 10.0.
+      cls.f_y = constant_op.constant(np.float32(0.30), name="f_y")
+      cls.f = math_ops.div(cls.b, cls.f_y, name="f")  # Should be 10.0.
 
-    # The there nodes x, y and z form a graph with "cross-links" in. I.e., x
-    # and y are both direct inputs to z, but x is also a direct input to y.
-    self.x = variables.Variable(2.0, name="x")  # Should be 2.0
-    self.y = math_ops.negative(self.x, name="y")  # Should be -2.0.
+      # The there nodes x, y and z form a graph with "cross-links" in. I.e., x
+      # and y are both direct inputs to z, but x is also a direct input to y.
+      cls.x = variables.Variable(2.0, name="x")  # Should be 2.0
+      cls.y = math_ops.negative(cls.x, name="y")  # Should be -2.0.
 
-    self.z = math_ops.multiply(self.x, self.y, name="z")  # Should be -4.0.
+      cls.z = math_ops.multiply(cls.x, cls.y, name="z")  # Should be -4.0.
+
+      init_op = variables.global_variables_initializer()
 
     rewriter_config = rewriter_config_pb2.RewriterConfig(
         disable_model_pruning=True,
@@ -60,11 +80,12 @@ class StepperTest(test_util.TensorFlowTestCase):
         constant_folding=rewriter_config_pb2.RewriterConfig.OFF)
     graph_options = config_pb2.GraphOptions(rewrite_options=rewriter_config)
     config = config_pb2.ConfigProto(graph_options=graph_options)
-    self.sess = session.Session(config=config)
-    self.sess.run(variables.global_variables_initializer())
+    cls.sess = session.Session(graph=cls.graph, config=config)
+    cls.sess.run(init_op)
 
-  def tearDown(self):
-    ops.reset_default_graph()
+  @classmethod
+  def tearDownClass(cls):
+    cls.sess.close()
 
   def testContToFetchNotInTransitiveClosureShouldError(self):
     with NodeStepper(self.sess, "e:0") as stepper:
@@ -90,28 +111,28 @@ class StepperTest(test_util.TensorFlowTestCase):
 
   def testContToNodeNameShouldReturnTensorValue(self):
     with NodeStepper(self.sess, "e:0") as stepper:
-      self.assertAllClose(6.0, stepper.cont("c"))
+      self.assertAllEqual(6.0, stepper.cont("c"))
 
   def testUsingNamesNotUsingIntermediateTensors(self):
     with NodeStepper(self.sess, "e:0") as stepper:
       # The first cont() call should have used no feeds.
       result = stepper.cont("c:0")
-      self.assertAllClose(6.0, result)
+      self.assertAllEqual(6.0, result)
       self.assertItemsEqual(["a/read:0", "b/read:0"],
                             stepper.intermediate_tensor_names())
-      self.assertAllClose(2.0, stepper.get_tensor_value("a/read:0"))
-      self.assertAllClose(3.0, stepper.get_tensor_value("b/read:0"))
+      self.assertAllEqual(2.0, stepper.get_tensor_value("a/read:0"))
+      self.assertAllEqual(3.0, stepper.get_tensor_value("b/read:0"))
       self.assertEqual({}, stepper.last_feed_types())
 
       # The second cont() call should have used the tensor handle from the
       # previous cont() call.
       result = stepper.cont("e:0")
-      self.assertAllClose(24.0, result)
+      self.assertAllEqual(24.0, result)
       self.assertItemsEqual(["a/read:0", "b/read:0", "d:0"],
                             stepper.intermediate_tensor_names())
-      self.assertAllClose(2.0, stepper.get_tensor_value("a/read:0"))
-      self.assertAllClose(3.0, stepper.get_tensor_value("b/read:0"))
-      self.assertAllClose(4.0, stepper.get_tensor_value("d:0"))
+      self.assertAllEqual(2.0, stepper.get_tensor_value("a/read:0"))
+      self.assertAllEqual(3.0, stepper.get_tensor_value("b/read:0"))
+      self.assertAllEqual(4.0, stepper.get_tensor_value("d:0"))
       self.assertEqual({
           "c:0": NodeStepper.FEED_TYPE_HANDLE,
           "a/read:0": NodeStepper.FEED_TYPE_DUMPED_INTERMEDIATE,
@@ -136,7 +157,7 @@ class StepperTest(test_util.TensorFlowTestCase):
       result = stepper.cont(self.c)
       self.assertItemsEqual(["a/read:0", "b/read:0"],
                             stepper.intermediate_tensor_names())
-      self.assertAllClose(6.0, result)
+      self.assertAllEqual(6.0, result)
       self.assertEqual({}, stepper.last_feed_types())
 
       self.assertEqual(["c:0"], stepper.handle_names())
@@ -144,10 +165,10 @@ class StepperTest(test_util.TensorFlowTestCase):
 
       # After the cont() call, the stepper should have access to the value of
       # c:0 via a tensor handle.
-      self.assertAllClose(6.0, stepper.get_tensor_value("c:0"))
+      self.assertAllEqual(6.0, stepper.get_tensor_value("c:0"))
 
       result = stepper.cont(self.e)
-      self.assertAllClose(24.0, result)
+      self.assertAllEqual(24.0, result)
       self.assertItemsEqual(["a/read:0", "b/read:0", "d:0"],
                             stepper.intermediate_tensor_names())
       self.assertEqual({
@@ -155,15 +176,29 @@ class StepperTest(test_util.TensorFlowTestCase):
           "a/read:0": NodeStepper.FEED_TYPE_DUMPED_INTERMEDIATE,
       }, stepper.last_feed_types())
 
+  def testRepeatedContCallsDoNotAddSessionHandleOps(self):
+    def num_session_handle_ops():
+      return len([op for op in self.sess.graph.get_operations()
+                  if op.type == "GetSessionHandle"])
+
+    with NodeStepper(self.sess, self.e) as stepper:
+      self.assertAllEqual(6.0, stepper.cont(self.c))
+      num_ops = num_session_handle_ops()
+
+      # Not using the cached tensor handle forces a Session.run() call, which
+      # should reuse the GetSessionHandle op created by the first cont() call.
+      self.assertAllEqual(6.0, stepper.cont(self.c, use_tensor_handles=False))
+      self.assertEqual(num_ops, num_session_handle_ops())
+
   def testContToTensorWithIntermediateDumpShouldUseDump(self):
     with NodeStepper(self.sess, ["e:0", "f:0"]) as stepper:
       stepper.cont("c:0")
       self.assertItemsEqual(["a/read:0", "b/read:0"],
                             stepper.intermediate_tensor_names())
-      self.assertAllClose(2.0, stepper.get_tensor_value("a/read:0"))
-      self.assertAllClose(3.0, stepper.get_tensor_value("b/read:0"))
+      self.assertAllEqual(2.0, stepper.get_tensor_value("a/read:0"))
+      self.assertAllEqual(3.0, stepper.get_tensor_value("b/read:0"))
 
-      self.assertAllClose(2.0, stepper.cont("a/read:0"))
+      self.assertAllEqual(2.0, stepper.cont("a/read:0"))
       self.assertEqual({
           "a/read:0": NodeStepper.FEED_TYPE_DUMPED_INTERMEDIATE
       }, stepper.last_feed_types())
@@ -178,8 +213,8 @@ class StepperTest(test_util.TensorFlowTestCase):
       stepper.cont("c:0")
       self.assertItemsEqual(["a/read:0", "b/read:0"],
                             stepper.intermediate_tensor_names())
-      self.assertAllClose(2.0, stepper.get_tensor_value("a/read:0"))
-      self.assertAllClose(3.0, stepper.get_tensor_value("b/read:0"))
+      self.assertAllEqual(2.0, stepper.get_tensor_value("a/read:0"))
+      self.assertAllEqual(3.0, stepper.get_tensor_value("b/read:0"))
 
       self.assertAllClose(10.0,
                           stepper.cont("f:0", use_dumped_intermediates=False))
@@ -195,7 +230,7 @@ class StepperTest(test_util.TensorFlowTestCase):
   def testOverrideValue(self):
     with NodeStepper(self.sess, self.e) as stepper:
       result = stepper.cont(self.c)
-      self.assertAllClose(6.0, result)
+      self.assertAllEqual(6.0, result)
       self.assertEqual({}, stepper.last_feed_types())
 
       # There should be no overrides before any cont() calls.
@@ -203,7 +238,7 @@ class StepperTest(test_util.TensorFlowTestCase):
 
       # Calling cont() on c again should lead to use of the handle.
       result = stepper.cont(self.c)
-      self.assertAllClose(6.0, result)
+      self.assertAllEqual(6.0, result)
       self.assertEqual({
           "c:0": NodeStepper.FEED_TYPE_HANDLE
       }, stepper.last_feed_types())
@@ -223,7 +258,7 @@ class StepperTest(test_util.TensorFlowTestCase):
 
       # Run a downstream tensor after the value override.
       result = stepper.cont(self.e)
-      self.assertAllClose(28.0, result)  # Should reflect the overriding value.
+      self.assertAllEqual(28.0, result)  # Should reflect the overriding value.
 
       # Should use override, instead of the handle.
       self.assertEqual({
@@ -231,11 +266,23 @@ class StepperTest(test_util.TensorFlowTestCase):
           "a/read:0": NodeStepper.FEED_TYPE_DUMPED_INTERMEDIATE,
       }, stepper.last_feed_types())
 
+  def testOverrideValueIsConvertedToTensorDType(self):
+    with NodeStepper(self.sess, self.e) as stepper:
+      stepper.override_tensor("c:0", 7.0)
+      override_value = stepper.get_tensor_value("c:0")
+      self.assertEqual(np.float32, override_value.dtype)
+      self.assertAllEqual(7.0, override_value)
+
+      # An overriding value that already has the right dtype is not copied.
+      overriding_array = np.array(8.0, dtype=np.float32)
+      stepper.override_tensor("c:0", overriding_array)
+      self.assertIs(overriding_array, stepper.get_tensor_value("c:0"))
+
   def testOverrideValueTwice(self):
     with NodeStepper(self.sess, self.e) as stepper:
       # Override once.
       stepper.override_tensor("c:0", 7.0)
-      self.assertAllClose(28.0, stepper.cont(self.e))
+      self.assertAllEqual(28.0, stepper.cont(self.e))
       self.assertEqual({
           "c:0": NodeStepper.FEED_TYPE_OVERRIDE
       }, stepper.last_feed_types())
@@ -258,7 +305,7 @@ class StepperTest(test_util.TensorFlowTestCase):
       self.assertEqual(set(), stepper.handle_node_names())
       self.assertEqual(["c:0"], stepper.override_names())
 
-      self.assertAllClose(32.0, stepper.cont(self.e))
+      self.assertAllEqual(32.0, stepper.cont(self.e))
       self.assertEqual({
           "c:0": NodeStepper.FEED_TYPE_OVERRIDE,
           "d:0": NodeStepper.FEED_TYPE_DUMPED_INTERMEDIATE,
@@ -267,7 +314,7 @@ class StepperTest(test_util.TensorFlowTestCase):
   def testRemoveOverrideValue(self):
     with NodeStepper(self.sess, self.e) as stepper:
       result = stepper.cont(self.c)
-      self.assertAllClose(6.0, result)
+      self.assertAllEqual(6.0, result)
       self.assertEqual({}, stepper.last_feed_types())
 
       # The previous cont() step should have generated a cached tensor handle.
@@ -283,7 +330,7 @@ class StepperTest(test_util.TensorFlowTestCase):
       self.assertEqual(["c:0"], stepper.override_names())
 
       result = stepper.cont(self.e)
-      self.assertAllClose(28.0, result)  # Should reflect the overriding value.
+      self.assertAllEqual(28.0, result)  # Should reflect the overriding value.
       self.assertEqual({
           "c:0": NodeStepper.FEED_TYPE_OVERRIDE,
           "a/read:0": NodeStepper.FEED_TYPE_DUMPED_INTERMEDIATE,
@@ -304,7 +351,7 @@ class StepperTest(test_util.TensorFlowTestCase):
       self.assertNotIn("e", stepper.handle_node_names())
 
       # Should reflect the non-overriding value.
-      self.assertAllClose(24.0, stepper.cont(self.e))
+      self.assertAllEqual(24.0, stepper.cont(self.e))
 
       # This time, the handle to tensor e:0 should have been cached again, even
       # thought its transitive closure contains an override.
@@ -312,7 +359,7 @@ class StepperTest(test_util.TensorFlowTestCase):
       self.assertIn("e", stepper.handle_node_names())
 
       # Calling cont(self.e) again should have used the tensor handle to e:0.
-      self.assertAllClose(24.0, stepper.cont(self.e))
+      self.assertAllEqual(24.0, stepper.cont(self.e))
       self.assertEqual({
           "e:0": NodeStepper.FEED_TYPE_HANDLE,
       }, stepper.last_feed_types())
@@ -320,12 +367,12 @@ class StepperTest(test_util.TensorFlowTestCase):
   def testOverrideAndContToSameTensor(self):
     with NodeStepper(self.sess, self.e) as stepper:
       result = stepper.cont(self.c)
-      self.assertAllClose(6.0, result)
+      self.assertAllEqual(6.0, result)
       self.assertEqual({}, stepper.last_feed_types())
       self.assertEqual(["c:0"], stepper.handle_names())
       self.assertSetEqual({"c"}, stepper.handle_node_names())
 
-      self.assertAllClose(6.0, stepper.cont(self.c))
+      self.assertAllEqual(6.0, stepper.cont(self.c))
 
       # The last cont() call should use the tensor handle directly.
       self.assertEqual({
@@ -341,7 +388,7 @@ class StepperTest(test_util.TensorFlowTestCase):
       self.assertSetEqual(set(), stepper.handle_node_names())
 
       result = stepper.cont(self.c)
-      self.assertAllClose(7.0, result)
+      self.assertAllEqual(7.0, result)
 
       self.assertEqual({
           "c:0": NodeStepper.FEED_TYPE_OVERRIDE
@@ -353,13 +400,13 @@ class StepperTest(test_util.TensorFlowTestCase):
       self.assertEqual(["a/read:0"], stepper.override_names())
 
       # Should reflect the overriding value.
-      self.assertAllClose(24000.0, stepper.cont("e:0"))
+      self.assertAllEqual(24000.0, stepper.cont("e:0"))
       self.assertEqual({
           "a/read:0": NodeStepper.FEED_TYPE_OVERRIDE
       }, stepper.last_feed_types())
 
       # Finalize call should have ignored the overriding value.
-      self.assertAllClose(24.0, stepper.finalize())
+      self.assertAllEqual(24.0, stepper.finalize())
 
   def testRemoveNonexistentOverrideValue(self):
     with NodeStepper(self.sess, self.e) as stepper:
@@ -389,20 +436,16 @@ class StepperTest(test_util.TensorFlowTestCase):
       self.assertLess(sorted_nodes.index("y"), sorted_nodes.index("z"))
 
   def testNodeStepperConstructorShouldAllowListOrTupleOrDictOfFetches(self):
-    for i in range(6):
-      if i == 0:
-        fetches = [self.e, [self.f, self.z]]
-      elif i == 1:
-        fetches = (self.e, (self.f, self.z))
-      elif i == 2:
-        fetches = {"e": self.e, "fz": {"f": self.f, "z": self.z}}
-      elif i == 3:
-        fetches = ["e:0", ["f:0", "z:0"]]
-      elif i == 4:
-        fetches = ("e:0", ("f:0", "z:0"))
-      elif i == 5:
-        fetches = {"e": "e:0", "fz": {"f": "f:0", "z": "z:0"}}
-
+    all_fetches = [
+        [self.e, [self.f, self.z]],
+        (self.e, (self.f, self.z)),
+        {"e": self.e, "fz": {"f": self.f, "z": self.z}},
+        ["e:0", ["f:0", "z:0"]],
+        ("e:0", ("f:0", "z:0")),
+        {"e": "e:0", "fz": {"f": "f:0", "z": "z:0"}},
+    ]
+
+    for fetches in all_fetches:
       with NodeStepper(self.sess, fetches) as stepper:
         sorted_nodes = stepper.sorted_nodes()
         self.assertEqual(13, len(sorted_nodes))
@@ -433,42 +476,44 @@ class StepperTest(test_util.TensorFlowTestCase):
         self.assertEqual([0], stepper.output_slots_in_closure("f"))
 
         result = stepper.finalize()
-        if i == 0 or i == 1 or i == 3 or i == 4:
-          self.assertAllClose(24.0, result[0])
+        if isinstance(fetches, (list, tuple)):
+          self.assertAllEqual(24.0, result[0])
           self.assertAllClose(10.0, result[1][0])
-          self.assertAllClose(-4.0, result[1][1])
-        elif i == 2 or i == 5:
-          self.assertAllClose(24.0, result["e"])
+          self.assertAllEqual(-4.0, result[1][1])
+        else:
+          self.assertAllEqual(24.0, result["e"])
           self.assertAllClose(10.0, result["fz"]["f"])
-          self.assertAllClose(-4.0, result["fz"]["z"])
+          self.assertAllEqual(-4.0, result["fz"]["z"])
 
 
 class StepperTestWithPlaceHolders(test_util.TensorFlowTestCase):
 
-  def setUp(self):
-    self.ph0 = array_ops.placeholder(dtypes.float32, shape=(2, 2), name="ph0")
-    self.ph1 = array_ops.placeholder(dtypes.float32, shape=(2, 1), name="ph1")
+  @classmethod
+  def setUpClass(cls):
+    cls.graph = ops.Graph()
+    with cls.graph.as_default():
+      cls.ph0 = array_ops.placeholder(dtypes.float32, shape=(2, 2), name="ph0")
+      cls.ph1 = array_ops.placeholder(dtypes.float32, shape=(2, 1), name="ph1")
 
-    self.x = math_ops.matmul(self.ph0, self.ph1, name="x")
-    self.y = math_ops.add(self.x, self.ph1, name="y")
+      cls.x = math_ops.matmul(cls.ph0, cls.ph1, name="x")
+      cls.y = math_ops.add(cls.x, cls.ph1, name="y")
 
-    self.sess = session.Session()
+    cls.sess = session.Session(graph=cls.graph)
 
-  def tearDown(self):
-    ops.reset_default_graph()
+  @classmethod
+  def tearDownClass(cls):
+    cls.sess.close()
 
   def testGetTensorValueWorksOnPlaceholder(self):
     with NodeStepper(
         self.sess,
         self.y,
         feed_dict={
-            self.ph0: [[1.0, 2.0], [-3.0, 5.0]],
-            self.ph1: [[-1.0], [0.5]]
+            self.ph0: _PH0_FEED,
+            self.ph1: _PH1_FEED
         }) as stepper:
-      self.assertAllClose([[1.0, 2.0], [-3.0, 5.0]],
-                          stepper.get_tensor_value("ph0"))
-      self.assertAllClose([[1.0, 2.0], [-3.0, 5.0]],
-                          stepper.get_tensor_value("ph0:0"))
+      self.assertAllEqual(_PH0_FEED, stepper.get_tensor_value("ph0"))
+      self.assertAllEqual(_PH0_FEED, stepper.get_tensor_value("ph0:0"))
       with self.assertRaisesRegexp(
           KeyError,
           r"The name 'ph0:1' refers to a Tensor which does not exist"):
@@ -495,15 +540,15 @@ class StepperTestWithPlaceHolders(test_util.TensorFlowTestCase):
         self.sess,
         self.y,
         feed_dict={
-            self.ph0: [[1.0, 2.0], [-3.0, 5.0]],
-            self.ph1: [[-1.0], [0.5]]
+            self.ph0: _PH0_FEED,
+            self.ph1: _PH1_FEED
         }) as stepper:
       self.assertEqual(4, len(stepper.sorted_nodes()))
       self.assertSetEqual({"ph0:0", "ph1:0", "x:0", "y:0"},
                           set(stepper.closure_elements()))
 
       result = stepper.cont(self.x)
-      self.assertAllClose([[0.0], [5.5]], result)
+      self.assertAllEqual(_X_EXPECTED, result)
       self.assertEqual({
           "ph0:0": NodeStepper.FEED_TYPE_CLIENT,
           "ph1:0": NodeStepper.FEED_TYPE_CLIENT,
@@ -513,7 +558,7 @@ class StepperTestWithPlaceHolders(test_util.TensorFlowTestCase):
       self.assertSetEqual({"x"}, stepper.handle_node_names())
 
       result = stepper.cont(self.y)
-      self.assertAllClose([[-1.0], [6.0]], result)
+      self.assertAllEqual(_Y_EXPECTED, result)
       self.assertEqual({
           "x:0": NodeStepper.FEED_TYPE_HANDLE,
           "ph1:0": NodeStepper.FEED_TYPE_CLIENT,
@@ -522,59 +567,55 @@ class StepperTestWithPlaceHolders(test_util.TensorFlowTestCase):
   def testAttemptToContToPlaceholderWithTensorFeedKeysShouldWork(self):
     """Continuing to a placeholder should be allowed, using client feed."""
 
-    ph0_feed = [[1.0, 2.0], [-3.0, 5.0]]
-    ph1_feed = [[-1.0], [0.5]]
     with NodeStepper(
         self.sess, self.y, feed_dict={
-            self.ph0: ph0_feed,
-            self.ph1: ph1_feed,
+            self.ph0: _PH0_FEED,
+            self.ph1: _PH1_FEED,
         }) as stepper:
-      self.assertAllClose(ph0_feed, stepper.cont(self.ph0))
+      self.assertAllEqual(_PH0_FEED, stepper.cont(self.ph0))
       self.assertEqual({
           self.ph0.name: NodeStepper.FEED_TYPE_CLIENT
       }, stepper.last_feed_types())
 
-      self.assertAllClose(ph1_feed, stepper.cont(self.ph1))
+      self.assertAllEqual(_PH1_FEED, stepper.cont(self.ph1))
       self.assertEqual({
           self.ph1.name: NodeStepper.FEED_TYPE_CLIENT
       }, stepper.last_feed_types())
 
       ph0_node = self.sess.graph.as_graph_element("ph0")
-      self.assertAllClose(ph0_feed, stepper.cont(ph0_node))
+      self.assertAllEqual(_PH0_FEED, stepper.cont(ph0_node))
       self.assertEqual({
           self.ph0.name: NodeStepper.FEED_TYPE_CLIENT
       }, stepper.last_feed_types())
 
-      self.assertAllClose([[-1.0], [6.0]], stepper.finalize())
+      self.assertAllEqual(_Y_EXPECTED, stepper.finalize())
 
   def testAttemptToContToPlaceholderWithTensorNameFeedKeysShouldWork(self):
 
-    ph0_feed = [[1.0, 2.0], [-3.0, 5.0]]
-    ph1_feed = [[-1.0], [0.5]]
     with NodeStepper(
         self.sess,
         self.y,
         feed_dict={
-            self.ph0.name: ph0_feed,
-            self.ph1.name: ph1_feed,
+            self.ph0.name: _PH0_FEED,
+            self.ph1.name: _PH1_FEED,
         }) as stepper:
-      self.assertAllClose(ph0_feed, stepper.cont(self.ph0))
+      self.assertAllEqual(_PH0_FEED, stepper.cont(self.ph0))
       self.assertEqual({
           self.ph0.name: NodeStepper.FEED_TYPE_CLIENT
       }, stepper.last_feed_types())
 
-      self.assertAllClose(ph1_feed, stepper.cont(self.ph1))
+      self.assertAllEqual(_PH1_FEED, stepper.cont(self.ph1))
       self.assertEqual({
           self.ph1.name: NodeStepper.FEED_TYPE_CLIENT
       }, stepper.last_feed_types())
 
       ph0_node = self.sess.graph.as_graph_element("ph0")
-      self.assertAllClose(ph0_feed, stepper.cont(ph0_node))
+      self.assertAllEqual(_PH0_FEED, stepper.cont(ph0_node))
       self.assertEqual({
           self.ph0.name: NodeStepper.FEED_TYPE_CLIENT
       }, stepper.last_feed_types())
 
-      self.assertAllClose([[-1.0], [6.0]], stepper.finalize())
+      self.assertAllEqual(_Y_EXPECTED, stepper.finalize())
 
 
 class StepperAssignAddTest(test_util.TensorFlowTestCase):
@@ -583,7 +624,7 @@ class StepperAssignAddTest(test_util.TensorFlowTestCase):
     self.v = variables.Variable(10.0, name="v")
     self.p = math_ops.add(self.v, self.v, name="p")
     self.q = math_ops.multiply(self.p, self.p, name="q")
-    self.delta = constant_op.constant(2.0, name="delta")
+    self.delta = constant_op.constant(np.float32(2.0), name="delta")
     self.v_add = state_ops.assign_add(self.v, self.delta, name="v_add")
     self.v_add_plus_one = math_ops.add(self.v_add,
                                        1.0,
@@ -607,16 +648,16 @@ class StepperAssignAddTest(test_util.TensorFlowTestCase):
 
   def testContToUpdateInvalidatesDumpedIntermediates(self):
     with NodeStepper(self.sess, [self.q, self.v_add]) as stepper:
-      self.assertAllClose(400.0, stepper.cont("q:0"))
+      self.assertAllEqual(400.0, stepper.cont("q:0"))
       self.assertItemsEqual(["v/read:0", "p:0"],
                             stepper.intermediate_tensor_names())
-      self.assertAllClose(10.0, stepper.get_tensor_value("v/read:0"))
-      self.assertAllClose(20.0, stepper.get_tensor_value("p:0"))
+      self.assertAllEqual(10.0, stepper.get_tensor_value("v/read:0"))
+      self.assertAllEqual(20.0, stepper.get_tensor_value("p:0"))
 
-      self.assertAllClose(
+      self.assertAllEqual(
           12.0, stepper.cont(
               self.v_add, invalidate_from_updated_variables=True))
-      self.assertAllClose(12.0, self.sess.run(self.v))
+      self.assertAllEqual(12.0, self.sess.run(self.v))
       self.assertSetEqual({self.v.name}, stepper.last_updated())
       self.assertItemsEqual(["v:0"], stepper.dirty_variables())
       # Updating the value of v by calling v_add should have invalidated the
@@ -630,17 +671,17 @@ class StepperAssignAddTest(test_util.TensorFlowTestCase):
 
       # The next cont to q should not have used any dumped intermediate tensors
       # and its result should reflect the updated value.
-      self.assertAllClose(576.0, stepper.cont("q:0"))
+      self.assertAllEqual(576.0, stepper.cont("q:0"))
       self.assertSetEqual(set(), stepper.last_updated())
       self.assertEqual({}, stepper.last_feed_types())
 
   def testOverridingUpstreamTensorInvalidatesDumpedIntermediates(self):
     with NodeStepper(self.sess, self.q) as stepper:
-      self.assertAllClose(400.0, stepper.cont("q:0"))
+      self.assertAllEqual(400.0, stepper.cont("q:0"))
       self.assertItemsEqual(["v/read:0", "p:0"],
                             stepper.intermediate_tensor_names())
-      self.assertAllClose(10.0, stepper.get_tensor_value("v/read:0"))
-      self.assertAllClose(20.0, stepper.get_tensor_value("p:0"))
+      self.assertAllEqual(10.0, stepper.get_tensor_value("v/read:0"))
+      self.assertAllEqual(20.0, stepper.get_tensor_value("p:0"))
 
       stepper.override_tensor("v/read:0", 11.0)
       self.assertItemsEqual(["v/read:0"], stepper.override_names())
@@ -650,7 +691,7 @@ class StepperAssignAddTest(test_util.TensorFlowTestCase):
 
       # The next cont to q should not have used any dumped intermediate tensors
       # and its result should reflect the overriding value.
-      self.assertAllClose(484.0, stepper.cont("q:0"))
+      self.assertAllEqual(484.0, stepper.cont("q:0"))
       self.assertEqual({
           "v/read:0": NodeStepper.FEED_TYPE_OVERRIDE
       }, stepper.last_feed_types())
@@ -660,7 +701,7 @@ class StepperAssignAddTest(test_util.TensorFlowTestCase):
       stepper.override_tensor("v/read:0", 9.0)
       self.assertItemsEqual(["v/read:0"], stepper.override_names())
 
-      self.assertAllClose(324.0, stepper.cont(self.q))
+      self.assertAllEqual(324.0, stepper.cont(self.q))
       self.assertItemsEqual(["p:0"], stepper.intermediate_tensor_names())
 
       stepper.remove_override("v/read:0")
@@ -673,23 +714,23 @@ class StepperAssignAddTest(test_util.TensorFlowTestCase):
     with NodeStepper(self.sess, self.v_add) as stepper:
       stepper.cont(self.v_add)
       self.assertSetEqual({self.v.name}, stepper.last_updated())
-      self.assertAllClose(12.0, stepper.cont(self.v))
+      self.assertAllEqual(12.0, stepper.cont(self.v))
       stepper.cont(self.v_add)
       self.assertSetEqual(set(), stepper.last_updated())
       self.assertEqual({"v_add:0": NodeStepper.FEED_TYPE_HANDLE},
                        stepper.last_feed_types())
-      self.assertAllClose(12.0, stepper.cont(self.v))
+      self.assertAllEqual(12.0, stepper.cont(self.v))
 
   def testRepeatedCallsToAssignAddDownStreamDoesNotUpdateVariableAgain(self):
     with NodeStepper(self.sess, self.v_add_plus_one) as stepper:
       stepper.cont(self.v_add_plus_one)
       self.assertSetEqual({self.v.name}, stepper.last_updated())
-      self.assertAllClose(12.0, stepper.cont(self.v))
+      self.assertAllEqual(12.0, stepper.cont(self.v))
       stepper.cont(self.v_add_plus_one)
       self.assertSetEqual(set(), stepper.last_updated())
       self.assertEqual({"v_add_plus_one:0": NodeStepper.FEED_TYPE_HANDLE},
                        stepper.last_feed_types())
-      self.assertAllClose(12.0, stepper.cont(self.v))
+      self.assertAllEqual(12.0, stepper.cont(self.v))
 
 
 class StepperBackwardRunTest(test_util.TensorFlowTestCase):
@@ -737,7 +778,7 @@ class StepperBackwardRunTest(test_util.TensorFlowTestCase):
   def testContToUpdateA(self):
     with NodeStepper(self.sess, "optim") as stepper:
       result = stepper.cont("a:0")
-      self.assertAllClose(1.0, result)
+      self.assertAllEqual(1.0, result)
       self.assertEqual({}, stepper.last_feed_types())
 
       result = stepper.cont("optim/learning_rate:0")
@@ -767,9 +808,8 @@ class StepperBackwardRunTest(test_util.TensorFlowTestCase):
       #   Because f = a * b * b * c, df / da = b * b * c.
       #   1.0 - learning_rate * b * b * c
       #     = 1.0 -  0.01 * 2.0 * 2.0 * 4.0 = 0.84.
-      self.assertAllClose(0.84, self.sess.run(self.a))
-      self.assertAllClose(2.0, self.sess.run(self.b))
-      self.assertAllClose(4.0, self.sess.run(self.c))
+      self.assertAllClose([0.84, 2.0, 4.0],
+                          self.sess.run([self.a, self.b, self.c]))
 
   def testContToUpdateB(self):
     with NodeStepper(self.sess, "optim") as stepper:
@@ -783,9 +823,8 @@ class StepperBackwardRunTest(test_util.TensorFlowTestCase):
       #   Because f = a * b * b * c, df / da = 2 * a * b * c.
       #   2.0 - learning_rate * 2 * a * b * c
       #     = 2.0 - 0.01 * 2 * 1.0 * 2.0 * 4.0 = 1.84
-      self.assertAllClose(1.0, self.sess.run(self.a))
-      self.assertAllClose(1.84, self.sess.run(self.b))
-      self.assertAllClose(4.0, self.sess.run(self.c))
+      self.assertAllClose([1.0, 1.84, 4.0],
+                          self.sess.run([self.a, self.b, self.c]))
 
   def testContAfterUpdateWithoutRestoringVariableValue(self):
     with NodeStepper(self.sess, "optim") as stepper:
@@ -797,9 +836,8 @@ class StepperBackwardRunTest(test_util.TensorFlowTestCase):
       self.assertIsNone(result)
       self.assertSetEqual({"a:0"}, stepper.last_updated())
       self.assertEqual(set(["a:0"]), stepper.dirty_variables())
-      self.assertAllClose(0.84, self.sess.run(self.a))
-      self.assertAllClose(2.0, self.sess.run(self.b))
-      self.assertAllClose(4.0, self.sess.run(self.c))
+      self.assertAllClose([0.84, 2.0, 4.0],
+                          self.sess.run([self.a, self.b, self.c]))
       # Tracking of the updated variables should have invalidated all
       # intermediate tensors downstream to a:0.
       self.assertNotIn("a/read:0", stepper.intermediate_tensor_names())
@@ -812,9 +850,8 @@ class StepperBackwardRunTest(test_util.TensorFlowTestCase):
       # For the backprop on Variable b under the updated value of a:
       #   2.0 - learning_rate * 2 * a' * b * c
       #     = 2.0 - 0.01 * 2 * 0.84 * 2.0 * 4.0 = 1.8656
-      self.assertAllClose(0.84, self.sess.run(self.a))
-      self.assertAllClose(1.8656, self.sess.run(self.b))
-      self.assertAllClose(4.0, self.sess.run(self.c))
+      self.assertAllClose([0.84, 1.8656, 4.0],
+                          self.sess.run([self.a, self.b, self.c]))
 
   def testContNotInvalidatingFromVariableUpdatesWorksForNextUpdate(self):
     with NodeStepper(self.sess, "optim") as stepper:
@@ -836,9 +873,8 @@ class StepperBackwardRunTest(test_util.TensorFlowTestCase):
       self.assertNotIn("b:0", stepper.intermediate_tensor_names())
       self.assertNotIn("c:0", stepper.intermediate_tensor_names())
 
-      self.assertAllClose(0.84, self.sess.run(self.a))
-      self.assertAllClose(2.0, self.sess.run(self.b))
-      self.assertAllClose(4.0, self.sess.run(self.c))
+      self.assertAllClose([0.84, 2.0, 4.0],
+                          self.sess.run([self.a, self.b, self.c]))
 
       # For the backprop on Variable b, the result should reflect the original
       # value of Variable a, even though Variable a has actually been updated.
@@ -848,9 +884,8 @@ class StepperBackwardRunTest(test_util.TensorFlowTestCase):
           "optim/update_b/ApplyGradientDescent",
           invalidate_from_updated_variables=False,
           restore_variable_values=False))
-      self.assertAllClose(0.84, self.sess.run(self.a))
-      self.assertAllClose(1.84, self.sess.run(self.b))
-      self.assertAllClose(4.0, self.sess.run(self.c))
+      self.assertAllClose([0.84, 1.84, 4.0],
+                          self.sess.run([self.a, self.b, self.c]))
 
   def testUpdateTwiceRestoreVariable(self):
     with NodeStepper(self.sess, "optim") as stepper:
@@ -874,9 +909,8 @@ class StepperBackwardRunTest(test_util.TensorFlowTestCase):
 
     # The result of the update should be identitcal to as if only update_b is
     # run.
-    self.assertAllClose(1.0, self.sess.run(self.a))
-    self.assertAllClose(1.84, self.sess.run(self.b))
-    self.assertAllClose(4.0, self.sess.run(self.c))
+    self.assertAllClose([1.0, 1.84, 4.0],
+                        self.sess.run([self.a, self.b, self.c]))
 
   def testSelectiveHandleUsageDependingOnTransitiveCleanliness(self):
     """Test tensor handlers are using only during clean transitive closure.
@@ -888,7 +922,7 @@ class StepperBackwardRunTest(test_util.TensorFlowTestCase):
       # First, call cont() on the two tensors on the intermediate level: e and
       # f.
       result = stepper.cont("d:0")
-      self.assertAllClose(2.0, result)
+      self.assertAllEqual(2.0, result)
       self.assertEqual({}, stepper.last_feed_types())
       self.assertItemsEqual(["a/read:0", "b/read:0"],
                             stepper.intermediate_tensor_names())
@@ -897,7 +931,7 @@ class StepperBackwardRunTest(test_util.TensorFlowTestCase):
       self.assertEqual(set(), stepper.dirty_variables())
 
       result = stepper.cont("e:0")
-      self.assertAllClose(8.0, result)
+      self.assertAllEqual(8.0, result)
       self.assertEqual({
           "b/read:0": NodeStepper.FEED_TYPE_DUMPED_INTERMEDIATE
       }, stepper.last_feed_types())
@@ -937,9 +971,8 @@ class StepperBackwardRunTest(test_util.TensorFlowTestCase):
 
       # The result of the update_b should be identical to as if no other
       # update_* cont() calls have occurred before.
-      self.assertAllClose(1.0, self.sess.run(self.a))
-      self.assertAllClose(1.84, self.sess.run(self.b))
-      self.assertAllClose(4.0, self.sess.run(self.c))
+      self.assertAllClose([1.0, 1.84, 4.0],
+                          self.sess.run([self.a, self.b, self.c]))
 
   def testRestoreVariableValues(self):
     """Test restore_variable_values() restores the old values of variables."""
@@ -952,7 +985,7 @@ class StepperBackwardRunTest(test_util.TensorFlowTestCase):
       self.assertAllClose(1.84, self.sess.run(self.b))
 
       stepper.restore_variable_values()
-      self.assertAllClose(2.0, self.sess.run(self.b))
+      self.assertAllEqual(2.0, self.sess.run(self.b))
 
   def testFinalize(self):
     """Test finalize() to restore variables and run the original fetch."""
@@ -969,16 +1002,15 @@ class StepperBackwardRunTest(test_util.TensorFlowTestCase):
 
       # The results of the Variable updates should be the same as if no cont()
       # call has occurred on update_b.
-      self.assertAllClose(0.84, self.sess.run(self.a))
-      self.assertAllClose(1.84, self.sess.run(self.b))
-      self.assertAllClose(3.96, self.sess.run(self.c))
+      self.assertAllClose([0.84, 1.84, 3.96],
+                          self.sess.run([self.a, self.b, self.c]))
 
   def testOverrideThenContToUpdateThenRemoveOverrideThenUpdateAgain(self):
     """Test cont() to update nodes after overriding tensor values."""
 
     with NodeStepper(self.sess, "optim") as stepper:
       result = stepper.cont("d:0")
-      self.assertAllClose(2.0, result)
+      self.assertAllEqual(2.0, result)
       self.assertEqual({}, stepper.last_feed_types())
       self.assertSetEqual(set(), stepper.last_updated())
       self.assertEqual(set(), stepper.dirty_variables())
@@ -1020,7 +1052,7 @@ class StepperBackwardRunTest(test_util.TensorFlowTestCase):
 
       # Obtain the tensor handle to d:0 again.
       result = stepper.cont("d:0")
-      self.assertAllClose(2.0, result)
+      self.assertAllEqual(2.0, result)
       self.assertEqual(["d:0"], stepper.handle_names())
       self.assertSetEqual({"d"}, stepper.handle_node_names())
       self.assertNotIn("a/read:0", stepper.last_feed_types())
@@ -1086,5 +1118,44 @@ class StepperBackwardRunTest(test_util.TensorFlowTestCase):
       }, stepper.last_feed_types())
 
 
+class StepperSharedInitialValueTest(test_util.TensorFlowTestCase):
+
+  def setUp(self):
+    # Variables a and b are created from the same initial-value tensor, so
+    # their Assign initializers share the same input tensor.
+    init = constant_op.constant(3.0, name="init")
+    self.a = variables.Variable(init, name="a")
+    self.b = variables.Variable(init, name="b")
+    self.f = math_ops.multiply(self.a, self.b, name="f")
+
+    gradient_descent.GradientDescentOptimizer(0.01).minimize(
+        self.f, name="optim")
+
+    self.sess = session.Session()
+    self.sess.run(variables.global_variables_initializer())
+    self.sess.run([state_ops.assign(self.a, 1.0),
+                   state_ops.assign(self.b, 2.0)])
+
+  def tearDown(self):
+    ops.reset_default_graph()
+
+  def testRestoreVariablesWithSharedInitialValue(self):
+    with NodeStepper(self.sess, "optim") as stepper:
+      stepper.cont(
+          "optim/update_a/ApplyGradientDescent",
+          invalidate_from_updated_variables=True,
+          restore_variable_values=False)
+      stepper.cont(
+          "optim/update_b/ApplyGradientDescent",
+          invalidate_from_updated_variables=True,
+          restore_variable_values=False)
+      self.assertEqual({"a:0", "b:0"}, stepper.dirty_variables())
+
+      # Each variable should be restored to its own cached value, not to the
+      # value cached for the other variable.
+      stepper.restore_variable_values()
+      self.assertAllEqual([1.0, 2.0], self.sess.run([self.a, self.b]))
+
+
 if __name__ == "__main__":
   googletest.main()